@@ -1,13 +1,24 @@
 from dotenv import load_dotenv
 load_dotenv()
 import os
+import sys
 import praw
-from praw.models import Submission, Comment
+from praw.models import Submission, Comment, Redditor
 from praw.exceptions import PRAWException
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 from redditwarp.ASYNC import Client
 from redditwarp.models.submission_ASYNC import LinkPost, TextPost, GalleryPost
 import logging
+import asyncio
+import copy
+import functools
+import inspect
+from itertools import islice
+import operator
+import threading
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 # IMPORTANT: Set these environment variables before running the server:
 # REDDIT_CLIENT_ID
@@ -15,33 +26,316 @@ import logging
 # REDDIT_USERNAME
 # REDDIT_PASSWORD
 
-from mcp.server.fastmcp import FastMCP
-
-mcp = FastMCP("Reddit-MCP-Server") # Keep existing MCP initialization
+from mcp.server.fastmcp import Context, FastMCP
 
 mcp = FastMCP("Reddit-MCP-Server")
 
-reddit = praw.Reddit(
-    client_id=os.environ.get("REDDIT_CLIENT_ID"),
-    client_secret=os.environ.get("REDDIT_CLIENT_SECRET"),
-    username=os.environ.get("REDDIT_USERNAME"),
-    password=os.environ.get("REDDIT_PASSWORD"),
-    user_agent=os.environ.get("REDDIT_USER_AGENT", "reddit-mcp-server")
-)
+@dataclass(frozen=True)
+class RedditConfig:
+    """Reddit credentials and user agent, read from the environment."""
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+    user_agent: str
+
+    @classmethod
+    def from_env(cls) -> "RedditConfig":
+        return cls(
+            client_id=os.environ.get("REDDIT_CLIENT_ID"),
+            client_secret=os.environ.get("REDDIT_CLIENT_SECRET"),
+            username=os.environ.get("REDDIT_USERNAME"),
+            password=os.environ.get("REDDIT_PASSWORD"),
+            user_agent=os.environ.get("REDDIT_USER_AGENT", "reddit-mcp-server"),
+        )
+
+def _create_once(factory: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Caches a zero-argument factory like functools.lru_cache(maxsize=1), but holds a lock around the call.
+
+    lru_cache does not serialize the first call, so tool calls starting together in worker threads could
+    each build their own client (and connection pool); with the lock only one is ever created.
+    """
+    cached = functools.lru_cache(maxsize=1)(factory)
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get():
+        with lock:
+            return cached()
+    return get
+
+# The clients are built on first use, so starting the server does no auth or connection setup.
+@_create_once
+def _config() -> RedditConfig:
+    """Returns the environment configuration, read once."""
+    return RedditConfig.from_env()
+
+@_create_once
+def _reddit() -> praw.Reddit:
+    """Returns the shared PRAW client, creating it on the first call."""
+    config = _config()
+    print(f"User Agent: {config.user_agent}")
+    return praw.Reddit(
+        client_id=config.client_id,
+        client_secret=config.client_secret,
+        username=config.username,
+        password=config.password,
+        user_agent=config.user_agent,
+    )
+
+@_create_once
+def _client() -> Client:
+    """Returns the shared redditwarp client, creating it on the first call."""
+    client = Client()
+    print(f"Redditwarp Client Initialized. Log Level: {logging.getLevelName(logging.getLogger().level)}")
+    return client
 
-client = Client()
 logging.getLogger().setLevel(logging.WARNING)
-print(f"User Agent: {os.environ.get('REDDIT_USER_AGENT')}")
-print(f"Redditwarp Client Initialized. Log Level: {logging.getLevelName(logging.getLogger().level)}")
+logger = logging.getLogger(__name__)
+
+# Tool results are cached in memory for about as long as Reddit caches its own listing pages.
+CACHE_TTL_SECONDS = 60
+CACHE_MAXSIZE = 1000
+# Upper bound on saved items scanned when get_saved_posts filters by subreddit.
+SAVED_POSTS_SCAN_LIMIT = 500
+# Reddit returns at most 100 items per listing page.
+LISTING_PAGE_SIZE = 100
+
+# Fetches the next listing page in the background while the current page is being processed.
+_page_prefetcher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="reddit-prefetch")
+
+# Attribute getters for the fields copied into tool results; attrgetter resolves them all in one C-level call.
+_POST_FIELDS = operator.attrgetter("title", "url", "author", "created_utc")
+_COMMENT_FIELDS = operator.attrgetter("id", "author", "body", "score", "created_utc")
+# Subreddit and author names repeat heavily across large results, so they are interned to share one string each.
+_DELETED = sys.intern("[deleted]")
+
+def _ttl_cached(ttl: float = CACHE_TTL_SECONDS, maxsize: int = CACHE_MAXSIZE, cache_if: Callable[[Any], bool] = bool):
+    """
+    Caches a tool's results keyed on its bound arguments for `ttl` seconds.
+
+    Only results for which `cache_if(result)` is true are stored, so the empty lists and
+    error strings the tools return on failure are never served from the cache.
+    The wrapper exposes `invalidate(predicate)` to drop entries whose argument tuple matches.
+    The MCP request Context parameter, if any, is not part of the key.
+    Results are deep-copied on the way in and out, so a caller mutating its result can't corrupt the cache.
+    Only coroutine functions (async tools) can be decorated.
+    """
+    def decorator(fn):
+        if not inspect.iscoroutinefunction(fn):
+            raise TypeError(f"_ttl_cached only supports async functions, got {fn.__qualname__}")
+        signature = inspect.signature(fn)
+        key_params = [name for name, param in signature.parameters.items() if param.annotation is not Context]
+        cache: dict[tuple, tuple[float, Any]] = {}
+
+        def make_key(args, kwargs) -> tuple:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments[name] for name in key_params)
+
+        def lookup(key: tuple):
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                cache.pop(key, None)
+                return None
+            return entry
+
+        def store(key: tuple, value: Any) -> None:
+            if not cache_if(value):
+                return
+            now = time.monotonic()
+            if len(cache) >= maxsize:
+                for stale_key in [k for k, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[stale_key]
+                while len(cache) >= maxsize:
+                    cache.pop(next(iter(cache))) # Evict the oldest entry
+            cache[key] = (now + ttl, copy.deepcopy(value))
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            entry = lookup(key)
+            if entry is not None:
+                return copy.deepcopy(entry[1])
+            value = await fn(*args, **kwargs)
+            store(key, value)
+            return value
+
+        def invalidate(predicate: Callable[[tuple], bool]) -> None:
+            for key in [k for k in cache if predicate(k)]:
+                cache.pop(key, None)
+
+        wrapper.cache = cache
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
+
+# PRAW is not thread-safe: its token refresh, rate limiter state and HTTP session have no locking of their own.
+# Tools run PRAW work in worker threads (and prefetch pages on `_page_prefetcher`), so every call that can reach
+# the network holds this lock. Building result dicts from already-fetched objects happens outside it.
+_praw_lock = threading.Lock()
+
+def _locked(fn: Callable, *args, **kwargs):
+    """Calls `fn` while holding `_praw_lock`."""
+    with _praw_lock:
+        return fn(*args, **kwargs)
+
+# The authenticated user never changes for the lifetime of the process, so /api/v1/me is only fetched once.
+_me: Optional[Redditor] = None
+
+def _authenticated_user() -> Optional[Redditor]:
+    """Returns the authenticated Redditor, calling reddit.user.me() only until it first succeeds."""
+    global _me
+    # Checked under the lock so concurrent first calls don't each request /api/v1/me
+    with _praw_lock:
+        if _me is None:
+            _me = _reddit().user.me()
+    return _me
+
+class _ProgressReporter:
+    """
+    Sends MCP progress notifications for a tool whose PRAW work runs in a worker thread.
+
+    Calling the reporter from the worker schedules `ctx.report_progress` on the tool's event loop
+    without blocking the PRAW work. `flush()` must be awaited before the tool returns, so every
+    notification reaches the client ahead of the result and failures are logged instead of lost.
+    Clients that did not request progress simply ignore the notifications.
+    """
+
+    def __init__(self, ctx: Context, total: int):
+        self._ctx = ctx
+        self._total = total
+        self._loop = asyncio.get_running_loop()
+        self._futures = []
+
+    def __call__(self, done: int) -> None:
+        self._futures.append(asyncio.run_coroutine_threadsafe(self._ctx.report_progress(done, self._total), self._loop))
+
+    async def flush(self) -> None:
+        results = await asyncio.gather(*(asyncio.wrap_future(f) for f in self._futures), return_exceptions=True)
+        self._futures.clear()
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Failed to send progress notification: %s", result)
+
+async def _run_with_progress(ctx: Optional[Context], total: int, fn: Callable[..., list], *args) -> list:
+    """Runs `fn(*args, report)` in a worker thread, passing a progress reporter (None without a Context)."""
+    if ctx is None:
+        return await asyncio.to_thread(fn, *args, None)
+    reporter = _ProgressReporter(ctx, total)
+    try:
+        return await asyncio.to_thread(fn, *args, reporter)
+    finally:
+        await reporter.flush()
+
+def _iter_prefetched(fetch_page: Callable[[Optional[str], int], list], limit: int, on_page: Optional[Callable[[], None]] = None, prefetch: bool = True) -> Iterator:
+    """
+    Yields up to `limit` listing items, requesting the page after the current one before yielding its items.
+
+    `fetch_page(after, count)` must return at most `count` items following the fullname `after`
+    (None for the first page). The next page is fetched on `_page_prefetcher` so its network
+    round-trip overlaps with the caller's processing of the current page.
+    Pass `prefetch=False` when the caller may stop before `limit` items (e.g. while filtering);
+    pages are then only fetched once the current one has been consumed, so none are wasted.
+    `on_page()`, if given, is called each time the caller has consumed a full page.
+    """
+    if limit <= 0:
+        return
+    remaining = limit
+    page = fetch_page(None, min(LISTING_PAGE_SIZE, remaining))
+    future = None
+    try:
+        while page:
+            requested = min(LISTING_PAGE_SIZE, remaining)
+            remaining -= len(page)
+            # A short page means the listing is exhausted
+            has_next = remaining > 0 and len(page) >= requested
+            if has_next and prefetch:
+                future = _page_prefetcher.submit(fetch_page, page[-1].fullname, min(LISTING_PAGE_SIZE, remaining))
+            yield from page
+            if on_page is not None:
+                on_page()
+            if not has_next:
+                return
+            if future is not None:
+                page, future = future.result(), None
+            else:
+                page = fetch_page(page[-1].fullname, min(LISTING_PAGE_SIZE, remaining))
+    finally:
+        if future is not None:
+            future.cancel() # The caller stopped early; skip the page if it has not started yet
+
+def _praw_get_saved_posts(limit: int = 25, subreddit: Optional[str] = None, report: Optional[Callable[[int], None]] = None) -> list:
+    """Blocking PRAW implementation of `get_saved_posts`, run in a worker thread."""
+    saved_posts = []
+    if limit <= 0:
+        # Nothing to return; the subreddit scan below would otherwise still fetch and keep a first match
+        return saved_posts
+    try:
+        print(f"Attempting to fetch {limit} saved posts. Subreddit filter: {subreddit or 'None'}")
+        
+        # Get the authenticated user object
+        me = _authenticated_user()
+        if not me:
+            print("Authentication failed: 'me' object is None. Cannot fetch saved posts.")
+            return []
+
+        # When filtering by subreddit, keep scanning past `limit` saved items until enough matches are found
+        subreddit_filter = subreddit.lower() if subreddit else None
+        fetch_limit = max(limit, SAVED_POSTS_SCAN_LIMIT) if subreddit_filter else limit
+
+        def fetch_page(after: Optional[str], count: int) -> list:
+            # type=links asks Reddit for saved submissions only, so saved comments don't use up the limit
+            with _praw_lock:
+                return list(me.saved(limit=count, params={"type": "links", "after": after}))
+
+        on_page = (lambda: report(len(saved_posts))) if report else None
+        # Without a filter every saved post counts toward `limit`, so the next page is always needed;
+        # with one, the matches may all be on the current page, so pages are fetched lazily
+        for item in _iter_prefetched(fetch_page, fetch_limit, on_page, prefetch=subreddit_filter is None):
+            # Still check the item is a submission (a post) in case the type filter is ignored
+            if isinstance(item, Submission):
+                # Read the subreddit name from the listing data once instead of going through item.subreddit repeatedly
+                sub_name = sys.intern(item.subreddit.display_name)
+                # Filter by subreddit if specified
+                if subreddit_filter and sub_name.lower() != subreddit_filter:
+                    continue
+
+                title, url, author_obj, created_utc = _POST_FIELDS(item)
+                logger.debug("Processing post: %s", title)
+                saved_posts.append({
+                    "title": title,
+                    "url": url,
+                    "author": sys.intern(author_obj.name) if author_obj is not None else _DELETED,
+                    "subreddit": sub_name,
+                    "created_utc": int(created_utc),
+                })
+                if len(saved_posts) >= limit:
+                    # Breaking out means the listing never reports this last page itself
+                    if report:
+                        report(len(saved_posts))
+                    break
+    except PRAWException as e:
+        print(f"An error occurred while fetching saved posts: {e}")
+        # Optionally, you might want to return an empty list or raise a more specific exception
+        return []
+    if not saved_posts:
+        print("No saved posts found or fetched.")
+    return saved_posts
 
 @mcp.tool()
-def get_saved_posts(limit: int = 25, subreddit: Optional[str] = None) -> list:
+@_ttl_cached()
+async def get_saved_posts(limit: int = 25, subreddit: Optional[str] = None, ctx: Context = None) -> list:
     """
     Fetches a list of saved Reddit posts for the authenticated user.
 
     Purpose of the function:
     This tool retrieves saved posts from the user's Reddit account.
     It can be optionally filtered by number of posts and/or a specific subreddit.
+    Progress is reported to the MCP client after each page of saved items is processed.
 
     Expected parameters:
     - limit (int, optional): The maximum number of saved posts to retrieve. Defaults to 25.
@@ -54,7 +348,7 @@ def get_saved_posts(limit: int = 25, subreddit: Optional[str] = None) -> list:
     - 'url': The URL of the post.
     - 'author': The username of the post's author.
     - 'subreddit': The subreddit the post belongs to.
-    - 'created_utc': The UTC timestamp of when the post was created.
+    - 'created_utc': The UTC timestamp (in whole seconds) of when the post was created.
 
     Usage examples:
     # To get the 50 most recent saved posts:
@@ -66,47 +360,58 @@ def get_saved_posts(limit: int = 25, subreddit: Optional[str] = None) -> list:
     # To get 10 saved posts from the "reactjs" subreddit:
     # mcp call reddit-mcp-server get_saved_posts --limit 10 --subreddit "reactjs"
     """
-    saved_posts = []
+    return await _run_with_progress(ctx, limit, _praw_get_saved_posts, limit, subreddit)
+
+def _praw_search_reddit(query: str, subreddit: Optional[str] = None, sort: str = "relevance", limit: int = 10, report: Optional[Callable[[int], None]] = None) -> list:
+    """Blocking PRAW implementation of `search_reddit`, run in a worker thread."""
+    search_results = []
     try:
-        print(f"Attempting to fetch {limit} saved posts. Subreddit filter: {subreddit or 'None'}")
+        print(f"Searching Reddit for query: '{query}' in subreddit: {subreddit or 'All Reddit'}, sorted by: {sort}, limit: {limit}")
         
-        # Get the authenticated user object
-        me = reddit.user.me()
-        if not me:
-            print("Authentication failed: 'me' object is None. Cannot fetch saved posts.")
-            return []
+        # Determine the search scope
+        if subreddit:
+            # Search within a specific subreddit
+            search = _reddit().subreddit(subreddit).search
+        else:
+            # Search across all of Reddit
+            search = _reddit().subreddits.search # Corrected for global search
 
-        # PRAW's saved() method returns a generator, so we iterate through it directly.
-        for item in me.saved(limit=limit):
-            # Check if the item is a submission (a post) and not a comment
-            if isinstance(item, Submission):
-                print(f"Processing post: {item.title}")
-                # Filter by subreddit if specified
-                if subreddit and item.subreddit.display_name.lower() != subreddit.lower():
-                    continue
+        def fetch_page(after: Optional[str], count: int) -> list:
+            with _praw_lock:
+                return list(search(query, sort=sort, limit=count, params={"after": after}))
 
-                saved_posts.append({
-                    "title": item.title,
-                    "url": item.url,
-                    "author": item.author.name if item.author else "[deleted]",
-                    "subreddit": item.subreddit.display_name,
-                    "created_utc": item.created_utc,
-                })
+        on_page = (lambda: report(len(search_results))) if report else None
+        posts = _iter_prefetched(fetch_page, limit, on_page)
+
+        for post in posts:
+            title, url, author_obj, created_utc = _POST_FIELDS(post)
+            search_results.append({
+                "title": title,
+                "url": url,
+                "author": sys.intern(author_obj.name) if author_obj is not None else _DELETED,
+                "subreddit": sys.intern(post.subreddit.display_name),
+                "created_utc": int(created_utc),
+            })
     except PRAWException as e:
-        print(f"An error occurred while fetching saved posts: {e}")
-        # Optionally, you might want to return an empty list or raise a more specific exception
+        print(f"An error occurred while searching Reddit: {e}")
         return []
-    if not saved_posts:
-        print("No saved posts found or fetched.")
-    return saved_posts
+    except Exception as e:
+        print(f"An unexpected error occurred during search: {e}")
+        return []
+
+    if not search_results:
+        print("No search results found.")
+    return search_results
 
 @mcp.tool()
-def search_reddit(query: str, subreddit: Optional[str] = None, sort: str = "relevance", limit: int = 10) -> list:
+@_ttl_cached()
+async def search_reddit(query: str, subreddit: Optional[str] = None, sort: str = "relevance", limit: int = 10, ctx: Context = None) -> list:
     """
     Searches Reddit for posts matching a given query.
 
     Purpose of the function:
     This tool allows searching for posts across all of Reddit or within a specific subreddit.
+    Progress is reported to the MCP client after each page of search results is processed.
 
     Expected parameters:
     - query (str): The search query.
@@ -121,7 +426,7 @@ def search_reddit(query: str, subreddit: Optional[str] = None, sort: str = "rele
     - 'url': The URL of the post.
     - 'author': The username of the post's author.
     - 'subreddit': The subreddit the post belongs to.
-    - 'created_utc': The UTC timestamp of when the post was created.
+    - 'created_utc': The UTC timestamp (in whole seconds) of when the post was created.
 
     Usage examples:
     # To search for "AI agents" across all of Reddit:
@@ -133,49 +438,61 @@ def search_reddit(query: str, subreddit: Optional[str] = None, sort: str = "rele
     # To get 10 top posts about "machine learning" from the past week:
     # mcp call reddit-mcp-server search_reddit --query "machine learning" --limit 10 --sort "top" --time_filter "week"
     """
-    search_results = []
+    return await _run_with_progress(ctx, limit, _praw_search_reddit, query, subreddit, sort, limit)
+
+def _praw_get_comments(submission_id: str, limit: int = 25, max_more: int = 0) -> list:
+    """Blocking PRAW implementation of `get_comments`, run in a worker thread."""
+    comments_list = []
+    if limit <= 0:
+        # Nothing to return; don't send Reddit a non-positive comment_limit or make any request
+        return comments_list
     try:
-        print(f"Searching Reddit for query: '{query}' in subreddit: {subreddit or 'All Reddit'}, sorted by: {sort}, limit: {limit}")
+        submission = _reddit().submission(id=submission_id)
+        print(f"Fetching {limit} comments for submission ID: {submission_id}")
+        # Ask Reddit for the top `limit` comments in the initial request; must be set before .comments is accessed
+        submission.comment_sort = "top"
+        submission.comment_limit = limit
         
-        # Determine the search scope
-        if subreddit:
-            # Search within a specific subreddit
-            target_subreddit = reddit.subreddit(subreddit)
-            posts = target_subreddit.search(query, sort=sort, limit=limit)
-        else:
-            # Search across all of Reddit
-            posts = reddit.subreddits.search(query, sort=sort, limit=limit) # Corrected for global search
-
-        for post in posts:
-            search_results.append({
-                "title": post.title,
-                "url": post.url,
-                "author": post.author.name if post.author else "[deleted]",
-                "subreddit": post.subreddit.display_name,
-                "created_utc": post.created_utc,
+        with _praw_lock:
+            # Only expand up to `max_more` "load more comments" placeholders; each one costs an extra API call
+            submission.comments.replace_more(limit=max_more)
+            all_comments = submission.comments.list()
+        # Filter out MoreComments objects lazily and stop as soon as `limit` comments are taken
+        comment_iter = (c for c in all_comments if isinstance(c, Comment))
+        for c in islice(comment_iter, limit):
+            comment_id, author_obj, body, score, created_utc = _COMMENT_FIELDS(c)
+            comments_list.append({
+                "id": comment_id,
+                "author": sys.intern(author_obj.name) if author_obj is not None else _DELETED,
+                "body": body,
+                "score": score,
+                "created_utc": int(created_utc),
             })
     except PRAWException as e:
-        print(f"An error occurred while searching Reddit: {e}")
+        print(f"An error occurred while fetching comments: {e}")
         return []
     except Exception as e:
-        print(f"An unexpected error occurred during search: {e}")
+        print(f"An unexpected error occurred: {e}")
         return []
 
-    if not search_results:
-        print("No search results found.")
-    return search_results
+    if not comments_list:
+        print(f"No comments found for submission ID: {submission_id} or API limit reached.")
+    return comments_list
 
 @mcp.tool()
-def get_comments(submission_id: str, limit: int = 25) -> list:
+@_ttl_cached()
+async def get_comments(submission_id: str, limit: int = 25, max_more: int = 0) -> list:
     """
     Fetches comments from a specific Reddit submission.
 
     Purpose of the function:
-    This tool retrieves comments associated with a given Reddit post ID.
+    This tool retrieves comments associated with a given Reddit post ID, sorted by top.
 
     Expected parameters:
     - submission_id (str): The ID of the Reddit submission (post) to fetch comments from.
     - limit (int, optional): The maximum number of comments to retrieve. Defaults to 25.
+    - max_more (int, optional): The maximum number of "load more comments" placeholders to expand.
+      Each expansion is an extra API request. Defaults to 0, which only returns the comments included in the initial response.
 
     Return values:
     A list of dictionaries, where each dictionary represents a comment
@@ -184,45 +501,19 @@ def get_comments(submission_id: str, limit: int = 25) -> list:
     - 'author': The username of the comment's author.
     - 'body': The text body of the comment.
     - 'score': The comment's score (upvotes minus downvotes).
-    - 'created_utc': The UTC timestamp of when the comment was created.
+    - 'created_utc': The UTC timestamp (in whole seconds) of when the comment was created.
 
     Usage examples:
-    # To get the first 50 comments from a submission with ID 'example_id':
+    # To get the top 50 comments from a submission with ID 'example_id':
     # mcp call reddit-mcp-server get_comments --submission_id "example_id" --limit 50
-    """
-    comments_list = []
-    try:
-        submission = reddit.submission(id=submission_id)
-        print(f"Fetching {limit} comments for submission ID: {submission_id}")
-        
-        # Limit the comments to the specified number
-        submission.comments.replace_more(limit=None) # To get all comments, not just top level
-        # Filter out MoreComments objects and apply limit
-        for c in submission.comments.list():
-            if isinstance(c, Comment): # Ensure it's a valid Comment object
-                comments_list.append({
-                    "id": c.id,
-                    "author": c.author.name if c.author else "[deleted]",
-                    "body": c.body,
-                    "score": c.score,
-                    "created_utc": c.created_utc,
-                })
-            # Apply limit after processing a comment
-            if len(comments_list) >= limit:
-                break
-    except PRAWException as e:
-        print(f"An error occurred while fetching comments: {e}")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return []
 
-    if not comments_list:
-        print(f"No comments found for submission ID: {submission_id} or API limit reached.")
-    return comments_list
+    # To also expand up to 2 "load more comments" placeholders on a large thread:
+    # mcp call reddit-mcp-server get_comments --submission_id "example_id" --limit 100 --max_more 2
+    """
+    return await asyncio.to_thread(_praw_get_comments, submission_id, limit, max_more)
 
 @mcp.tool()
-def reply_to_comment(comment_id: str, text: str) -> str:
+async def reply_to_comment(comment_id: str, text: str) -> str:
     """
     Replies to a specific Reddit comment.
 
@@ -241,11 +532,12 @@ def reply_to_comment(comment_id: str, text: str) -> str:
     # mcp call reddit-mcp-server reply_to_comment --comment_id "abcdef" --text "This is my reply."
     """
     try:
-        comment = reddit.comment(id=comment_id)
+        comment = _reddit().comment(id=comment_id)
         print(f"Attempting to reply to comment ID: {comment_id}")
-        reply_object = comment.reply(body=text)
+        reply_object = await asyncio.to_thread(_locked, comment.reply, body=text)
         if reply_object: # Check if the reply operation was successful
             print(f"Successfully replied to comment ID: {comment_id}. New comment ID: {reply_object.id}")
+            _invalidate_submission_cache(reply_object.link_id.split("_", 1)[-1])
             return f"Successfully replied to comment. New comment ID: {reply_object.id}"
         else:
             print(f"Failed to reply to comment ID: {comment_id}. Reply object was None.")
@@ -256,6 +548,12 @@ def reply_to_comment(comment_id: str, text: str) -> str:
     except Exception as e:
         print(f"An unexpected error occurred while replying to comment: {e}")
         return f"Failed to reply to comment due to an unexpected error: {e}"
+
+def _invalidate_submission_cache(submission_id: str) -> None:
+    """Drops cached comment listings and post content for a submission after it changes."""
+    get_comments.invalidate(lambda key: key[0] == submission_id)
+    fetch_reddit_post_content.invalidate(lambda key: key[0] == submission_id)
+
 # Helper to determine post type (adapted for synchronous PRAW)
 def _praw_get_post_type(submission: Submission) -> str:
     """Helper method to determine post type based on PRAW Submission attributes."""
@@ -280,38 +578,57 @@ def _praw_get_content(submission: Submission) -> Optional[str]:
 
 # Helper to format comment tree synchronously (PRAW)
 def _praw_format_comment_tree(comment: Comment, indent_level: int, max_depth: int) -> str:
-    """Recursively formats a comment and its replies."""
-    if indent_level >= max_depth:
-        return ""
+    """
+    Formats a comment and its replies depth-first, using an explicit stack instead of recursion.
 
+    The tree is walked purely in memory: call `submission.comments.replace_more(...)` once on the
+    submission beforehand to load any replies wanted, since remaining MoreComments are skipped.
+    """
+    parts: list[str] = []
     indent_str = "    " * indent_level
-    author = comment.author.name if comment.author else '[deleted]'
-    body = comment.body.replace('\n', '\n' + indent_str + '    ') # Indent multi-line comments
-
-    formatted_comment = f"{indent_str}- Author: {author}, Score: {comment.score}\n{indent_str}  {body}\n"
-
-    if hasattr(comment, 'replies') and comment.replies:
-        comment.replies.replace_more(limit=None) # Ensure all replies are loaded
-        for reply in comment.replies:
-            if isinstance(reply, Comment): # Make sure it's a Comment object, not MoreComments
-                formatted_comment += _praw_format_comment_tree(reply, indent_level + 1, max_depth)
-    return formatted_comment
+    # Each entry carries its indent and the prefix for continuation lines of its body, built once per level
+    stack = [(comment, indent_level, indent_str, "\n" + indent_str + "    ")]
+    while stack:
+        comment, indent_level, indent_str, body_prefix = stack.pop()
+        if indent_level >= max_depth:
+            continue
+
+        author = comment.author.name if comment.author else '[deleted]'
+        body = comment.body
+        if "\n" in body: # Indent multi-line comments
+            body = body.replace("\n", body_prefix)
+        parts.append(f"{indent_str}- Author: {author}, Score: {comment.score}\n{indent_str}  {body}\n")
+
+        if hasattr(comment, 'replies') and comment.replies:
+            child_indent = body_prefix[1:] # Replies are indented one level, like this comment's continuation lines
+            child_prefix = body_prefix + "    "
+            # Push in reverse so replies are popped, and therefore emitted, in their original order
+            for reply in reversed(comment.replies):
+                if isinstance(reply, Comment): # Make sure it's a Comment object, not MoreComments
+                    stack.append((reply, indent_level + 1, child_indent, child_prefix))
+    return "".join(parts)
 
 # NEW redditwarp-based functions
 def _redditwarp_format_comment_tree(comment_node, depth: int = 0) -> str:
-    """Helper method to recursively format comment tree with proper indentation for redditwarp"""
-    comment = comment_node.value
-    indent = "-- " * depth
-    content = (
-        f"{indent}* Author: {comment.author_display_name or '[deleted]'}\n"
-        f"{indent}  Score: {comment.score}\n"
-        f"{indent}  {comment.body}\n"
-    )
-
-    for child in comment_node.children:
-        content += "\n" + _redditwarp_format_comment_tree(child, depth + 1)
+    """Helper method to format comment tree with proper indentation for redditwarp, using an explicit stack instead of recursion"""
+    parts: list[str] = []
+    stack = [(comment_node, "-- " * depth)]
+    while stack:
+        node, indent = stack.pop()
+        comment = node.value
+        if parts:
+            parts.append("\n") # Blank line between a comment and each of its replies
+        parts.append(
+            f"{indent}* Author: {comment.author_display_name or '[deleted]'}\n"
+            f"{indent}  Score: {comment.score}\n"
+            f"{indent}  {comment.body}\n"
+        )
+        child_indent = indent + "-- "
+        # Push in reverse so children are popped, and therefore emitted, in their original order
+        for child in reversed(node.children):
+            stack.append((child, child_indent))
 
-    return content
+    return "".join(parts)
 
 def _redditwarp_get_post_type(submission) -> str:
     """Helper method to determine post type for redditwarp"""
@@ -335,6 +652,7 @@ def _redditwarp_get_content(submission) -> Optional[str]:
 
 
 @mcp.tool()
+@_ttl_cached(cache_if=lambda content: not content.startswith("An error occurred"))
 async def fetch_reddit_post_content(post_id: str, comment_limit: int = 20, comment_depth: int = 3) -> str:
     """
     Fetch detailed content of a specific post
@@ -348,7 +666,7 @@ async def fetch_reddit_post_content(post_id: str, comment_limit: int = 20, comme
         Human readable string containing post content and comments tree
     """
     try:
-        submission = await client.p.submission.fetch(post_id)
+        submission = await _client().p.submission.fetch(post_id)
         
         content = (
             f"Title: {submission.title}\n"
@@ -358,7 +676,7 @@ async def fetch_reddit_post_content(post_id: str, comment_limit: int = 20, comme
             f"Content: {_redditwarp_get_content(submission)}\n" # Using redditwarp specific helper
         )
 
-        comments = await client.p.comment_tree.fetch(post_id, sort='top', limit=comment_limit, depth=comment_depth)
+        comments = await _client().p.comment_tree.fetch(post_id, sort='top', limit=comment_limit, depth=comment_depth)
         if comments.children:
             content += "\nComments:\n"
             for comment in comments.children: